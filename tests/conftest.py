@@ -9,14 +9,19 @@
 # Any modifications or derivative works of this code must retain this
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
-import io
+import dataclasses
+import itertools
 import json
+import os
 import re
+import shutil
+import tempfile
 from pathlib import Path
 from tempfile import gettempdir
 from typing import Any, Dict
 
 import h5py
+import orjson
 import pytest
 import requests_mock as rq_mock
 from requests import Request
@@ -28,36 +33,42 @@ API_URL = "https://api.tergite.example"
 QUANTUM_COMPUTER_URL = "http://loke.tergite.example"
 API_TOKEN = "some-token"
 BACKENDS_LIST = load_json_fixture("many_backends.json")
+BACKENDS_BY_NAME = {record["name"]: record for record in BACKENDS_LIST}
 _QOBJ_RESULTS = load_json_fixture("qobj_results.json")
 TEST_JOB_ID = "test_job_id"
 TEST_QOBJ_ID = "test_qobj_id"
 NUMBER_OF_SHOTS = 100
 
-_BACKENDS_URL = f"{API_URL}/v2/devices"
-_JOBS_URL = f"{API_URL}/jobs"
-_TEST_JOB_RESULTS_URL = f"{API_URL}/jobs/{TEST_JOB_ID}"
-_TEST_RESULTS_DOWNLOAD_PATH = f"{QUANTUM_COMPUTER_URL}/test_file.hdf5"
+
+@dataclasses.dataclass(frozen=True)
+class MockUrls:
+    """The endpoints of the mock apis, built once at import"""
+
+    backends: str = f"{API_URL}/v2/devices"
+    jobs: str = f"{API_URL}/jobs"
+    test_job_results: str = f"{API_URL}/jobs/{TEST_JOB_ID}"
+    test_results_download: str = f"{QUANTUM_COMPUTER_URL}/test_file.hdf5"
+
+
+URLS = MockUrls()
+
 _TEST_JOB = {"job_id": TEST_JOB_ID, "upload_url": QUANTUM_COMPUTER_URL}
 _HALF_NUMBER_OF_SHOTS = int(NUMBER_OF_SHOTS / 2)
-_TMP_RESULTS_PATH = Path(gettempdir()) / f"{TEST_JOB_ID}.hdf5"
 _CALIBRATIONS_REGEX = re.compile(f"^{API_URL}/v2/calibrations/([\w-]+)")
 _JOBS_REGISTER_URL_REGEX = re.compile(f"^{API_URL}/jobs\?backend=([\w-]+)")
 _QC_URL_REGEX = re.compile(r"^http://([\w-]+)\.tergite\.example")
 _JOBS_RESULTS_URL_REGEX = re.compile(f"{API_URL}/jobs/([\w-]+)")
-_JOBS_LOGFILE_URL_REGEX = re.compile(
-    r"^http://([\w-]+)\.tergite\.example/test_file.hdf5"
-)
 
 TEST_JOB_RESULTS = {
     "status": "DONE",
-    "download_url": _TEST_RESULTS_DOWNLOAD_PATH,
+    "download_url": URLS.test_results_download,
     "result": {
         "memory": [
             (["0x1"] * _HALF_NUMBER_OF_SHOTS) + (["0x0"] * _HALF_NUMBER_OF_SHOTS)
         ],
     },
 }
-RAW_TEST_JOB_RESULTS = json.dumps(TEST_JOB_RESULTS).encode("utf-8")
+RAW_TEST_JOB_RESULTS = orjson.dumps(TEST_JOB_RESULTS)
 GOOD_BACKENDS = ["Well-formed", "loke", "qiskit_pulse_1q", "qiskit_pulse_2q"]
 TWO_QUBIT_BACKENDS = ["Well-formed", "loke", "qiskit_pulse_2q"]
 MALFORMED_BACKEND = "Malformed"
@@ -92,67 +103,115 @@ TEST_QOBJ_RESULTS_MAP = {
 }
 
 
+def pytest_configure(config):
+    """Gives each pytest-xdist worker a temporary directory of its own
+
+    The SDK saves job logfiles at fixed paths in the temporary directory,
+    so workers sharing one temporary directory would overwrite each other's files.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        tempfile.tempdir = tempfile.mkdtemp(prefix=f"tergite-{worker}-")
+
+
+def pytest_unconfigure(config):
+    """Removes the temporary directory of the pytest-xdist worker"""
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        shutil.rmtree(tempfile.tempdir, ignore_errors=True)
+        tempfile.tempdir = None
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrizes the tests that take an invalid token and a backend name
+
+    The pairs of invalid tokens and backend names are only generated for the
+    tests that request both.
+    """
+    if {"token", "backend_name"} <= set(metafunc.fixturenames):
+        metafunc.parametrize(
+            "token, backend_name",
+            itertools.product(INVALID_API_TOKENS, GOOD_BACKENDS),
+            # the ids are the plain strings, so pytest need not infer them
+            ids=str,
+        )
+
+
 @pytest.fixture
-def api(requests_mock):
+def api(_api_mocker):
     """The mock api without auth"""
-    requests_mock.get(_BACKENDS_URL, headers={}, json=BACKENDS_LIST)
+    yield from _run_mocker(_api_mocker)
+
+
+@pytest.fixture
+def bearer_auth_api(_bearer_auth_api_mocker):
+    """The mock api with bearer auth"""
+    yield from _run_mocker(_bearer_auth_api_mocker)
+
+
+@pytest.fixture
+def api_with_logfile(_api_with_logfile_mocker):
+    """A mock api fixture for tests that need to use TEST_JOB_RESULTS_LOGFILE."""
+    yield from _run_mocker(_api_with_logfile_mocker)
+
+
+@pytest.fixture(scope="session")
+def _api_mocker():
+    """The session-wide mocker of the mock api without auth"""
+    requests_mock = rq_mock.Mocker()
+    requests_mock.get(URLS.backends, headers={}, json=BACKENDS_LIST)
 
     # job registration
-    requests_mock.post(_JOBS_URL, headers={}, json=_TEST_JOB)
+    requests_mock.post(URLS.jobs, headers={}, json=_TEST_JOB)
     # job upload
     requests_mock.post(QUANTUM_COMPUTER_URL, headers={}, status_code=200)
     # job results
-    requests_mock.get(_TEST_JOB_RESULTS_URL, headers={}, json=TEST_JOB_RESULTS)
+    requests_mock.get(URLS.test_job_results, headers={}, json=TEST_JOB_RESULTS)
     # download file
     requests_mock.get(
-        _TEST_RESULTS_DOWNLOAD_PATH, headers={}, content=RAW_TEST_JOB_RESULTS
+        URLS.test_results_download, headers={}, content=RAW_TEST_JOB_RESULTS
     )
     requests_mock.get(_CALIBRATIONS_REGEX, headers={}, json=_mock_calibrations_handler)
     yield requests_mock
 
 
-@pytest.fixture
-def bearer_auth_api(requests_mock):
-    """The mock api with bearer auth"""
+@pytest.fixture(scope="session")
+def _bearer_auth_api_mocker():
+    """The session-wide mocker of the mock api with bearer auth"""
+    requests_mock = rq_mock.Mocker()
     request_headers = {"Authorization": f"Bearer {API_TOKEN}"}
 
-    no_auth_matcher = _without_headers(request_headers)
-    requests_mock.get(
-        _BACKENDS_URL, request_headers=request_headers, json=BACKENDS_LIST
-    )
+    # unauthorized fallbacks are registered first, so that requests_mock, which
+    # tries the most recently registered matchers first, only returns them when
+    # the request_headers of the authorized mocks do not match
+    requests_mock.get(URLS.backends, status_code=401)
+    requests_mock.post(URLS.jobs, status_code=401)
+    requests_mock.post(QUANTUM_COMPUTER_URL, status_code=401)
+    requests_mock.get(URLS.test_job_results, status_code=401)
+    requests_mock.get(URLS.test_results_download, status_code=401)
+
     requests_mock.get(
-        _BACKENDS_URL, status_code=401, additional_matcher=no_auth_matcher
+        URLS.backends, request_headers=request_headers, json=BACKENDS_LIST
     )
 
     # job registration
-    requests_mock.post(_JOBS_URL, request_headers=request_headers, json=_TEST_JOB)
-    requests_mock.post(_JOBS_URL, status_code=401, additional_matcher=no_auth_matcher)
+    requests_mock.post(URLS.jobs, request_headers=request_headers, json=_TEST_JOB)
 
     # job upload
     requests_mock.post(
         QUANTUM_COMPUTER_URL, request_headers=request_headers, status_code=200
     )
-    requests_mock.post(
-        QUANTUM_COMPUTER_URL, status_code=401, additional_matcher=no_auth_matcher
-    )
 
     # job results
     requests_mock.get(
-        _TEST_JOB_RESULTS_URL, request_headers=request_headers, json=TEST_JOB_RESULTS
-    )
-    requests_mock.get(
-        _TEST_JOB_RESULTS_URL, status_code=401, additional_matcher=no_auth_matcher
+        URLS.test_job_results, request_headers=request_headers, json=TEST_JOB_RESULTS
     )
 
     # download file
     requests_mock.get(
-        _TEST_RESULTS_DOWNLOAD_PATH,
+        URLS.test_results_download,
         request_headers=request_headers,
         content=RAW_TEST_JOB_RESULTS,
     )
-    requests_mock.get(
-        _TEST_RESULTS_DOWNLOAD_PATH, status_code=401, additional_matcher=no_auth_matcher
-    )
 
     # # Add the missing mock for the calibration request
     requests_mock.get(
@@ -163,30 +222,11 @@ def bearer_auth_api(requests_mock):
     yield requests_mock
 
 
-@pytest.fixture
-def tmp_results_file():
-    """The path to the tmp file where results are downloaded"""
-    yield _TMP_RESULTS_PATH
-    _TMP_RESULTS_PATH.unlink()
-
-
-@pytest.fixture
-def mock_tergiterc() -> Path:
-    """The mock tergite rc file path"""
-    tergiterc_file = Path(gettempdir()) / ".qiskit" / "test_tergiterc"
-    tergiterc_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(tergiterc_file, mode="w") as file:
-        pass
-
-    yield tergiterc_file
-    tergiterc_file.unlink(missing_ok=True)
-
-
-@pytest.fixture
-def api_with_logfile(requests_mock):
-    """A mock api fixture for tests that need to use TEST_JOB_RESULTS_LOGFILE."""
-    requests_mock.get(_BACKENDS_URL, headers={}, json=BACKENDS_LIST)
+@pytest.fixture(scope="session")
+def _api_with_logfile_mocker():
+    """The session-wide mocker of the mock api that serves logfiles"""
+    requests_mock = rq_mock.Mocker()
+    requests_mock.get(URLS.backends, headers={}, json=BACKENDS_LIST)
 
     # Job registration
     requests_mock.post(
@@ -200,27 +240,56 @@ def api_with_logfile(requests_mock):
         _JOBS_RESULTS_URL_REGEX, headers={}, json=_mock_job_results_handler
     )
 
-    # Download file - use hdf5_content
-    requests_mock.get(
-        _JOBS_LOGFILE_URL_REGEX, headers={}, content=_mock_logfile_download_handler
-    )
+    # Download file - use the prebuilt hdf5 content of each backend
+    for backend, content in _LOGFILE_CONTENT_MAP.items():
+        requests_mock.get(
+            TEST_LOGFILE_DOWNLOAD_MAP[backend], headers={}, content=content
+        )
 
     # # Add the mock for the calibration request
     requests_mock.get(_CALIBRATIONS_REGEX, json=_mock_calibrations_handler)
     yield requests_mock
 
 
-def _without_headers(headers):
-    """Matches requests that don't have the given headers"""
+@pytest.fixture
+def tmp_results_file():
+    """The path to the tmp file where results are downloaded"""
+    tmp_results_path = Path(gettempdir()) / f"{TEST_JOB_ID}.hdf5"
+    yield tmp_results_path
+    tmp_results_path.unlink()
 
-    def matcher(request):
-        for k, v in headers.items():
-            if request.headers.get(k) != v:
-                return True
 
-        return False
+@pytest.fixture
+def mock_tergiterc() -> Path:
+    """The mock tergite rc file path"""
+    tergiterc_file = Path(gettempdir()) / ".qiskit" / "test_tergiterc"
+    tergiterc_file.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(tergiterc_file, mode="w") as file:
+        pass
 
-    return matcher
+    yield tergiterc_file
+    tergiterc_file.unlink(missing_ok=True)
+
+
+def _run_mocker(mocker: rq_mock.Mocker):
+    """Activates the given session-wide mocker for the duration of a single test
+
+    The registered mocks are kept across tests but the request history is
+    cleared at the end of each test.
+
+    Args:
+        mocker: the session-wide mocker with all the mocks already registered
+
+    Yields:
+        the activated mocker
+    """
+    mocker.start()
+    try:
+        yield mocker
+    finally:
+        mocker.stop()
+        mocker.reset_mock()
 
 
 def _mock_calibrations_handler(request: Request, context: Any) -> Dict[str, Any]:
@@ -280,34 +349,40 @@ def _mock_job_results_handler(request: Request, context: Any) -> Dict[str, Any]:
         raise rq_mock.NoMockAddress(request)
 
 
-def _mock_logfile_download_handler(request: Request, context: Any):
-    """Mock API handler for the logfile download endpoint
+def _get_logfile_content(backend_name: str) -> bytes:
+    """Generates the HDF5 logfile content for the given backend
 
     Args:
-        request: the request caught
-        context: the object with the extra context passed when creating mock e.g. headers
+        backend_name: the name of the backend whose logfile is to be generated
 
     Returns:
-        the JSON data in dict form to be returned on the given endpoint
+        the bytes of the HDF5 logfile
     """
-    matcher = _JOBS_LOGFILE_URL_REGEX.match(request.url)
-    try:
-        backend = matcher.group(1)
-        qobj = {**TEST_QOBJ_RESULTS_MAP[backend.lower()]}
-        hdf5_file = io.BytesIO()
-        with h5py.File(hdf5_file, "w") as hdf:
-            header_group = hdf.create_group("header")
-            qobj_metadata_group = header_group.create_group("qobj_metadata")
-
-            qobj_metadata_group.attrs["shots"] = qobj["config"]["shots"]
-            qobj_metadata_group.attrs["qobj_id"] = qobj["qobj_id"]
-            qobj_metadata_group.attrs["num_experiments"] = len(qobj["experiments"])
-
-            qobj_data_group = header_group.create_group("qobj_data")
-            experiment_data = json.dumps(qobj, cls=PulseQobj_encoder, indent="\t")
-            qobj_data_group.attrs["experiment_data"] = experiment_data
-
-        hdf5_file.seek(0)
-        return hdf5_file.read()
-    except (AttributeError, KeyError):
-        raise rq_mock.NoMockAddress(request)
+    qobj = {**TEST_QOBJ_RESULTS_MAP[backend_name.lower()]}
+    # the latest file format has the most compact metadata for these tiny files
+    # and the core driver without a backing store keeps the file in memory only
+    with h5py.File(
+        f"{backend_name}.hdf5",
+        "w",
+        libver="latest",
+        driver="core",
+        backing_store=False,
+    ) as hdf:
+        header_group = hdf.create_group("header")
+        qobj_metadata_group = header_group.create_group("qobj_metadata")
+
+        qobj_metadata_group.attrs["shots"] = qobj["config"]["shots"]
+        qobj_metadata_group.attrs["qobj_id"] = qobj["qobj_id"]
+        qobj_metadata_group.attrs["num_experiments"] = len(qobj["experiments"])
+
+        qobj_data_group = header_group.create_group("qobj_data")
+        experiment_data = json.dumps(qobj, cls=PulseQobj_encoder, indent="\t")
+        qobj_data_group.attrs["experiment_data"] = experiment_data
+
+        hdf.flush()
+        return hdf.id.get_file_image()
+
+
+_LOGFILE_CONTENT_MAP = {
+    backend: _get_logfile_content(backend) for backend in GOOD_BACKENDS
+}
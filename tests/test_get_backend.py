@@ -18,23 +18,17 @@ from tergite.qiskit.providers.provider_account import ProviderAccount
 from tests.conftest import (
     API_TOKEN,
     API_URL,
-    BACKENDS_LIST,
+    BACKENDS_BY_NAME,
     GOOD_BACKENDS,
-    INVALID_API_TOKENS,
     MALFORMED_BACKEND,
 )
-from tests.utils.records import get_record
 
-_INVALID_PARAMS = [
-    (token, backend) for backend in GOOD_BACKENDS for token in INVALID_API_TOKENS
-]
 
-
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
+@pytest.mark.parametrize("backend_name", GOOD_BACKENDS, ids=GOOD_BACKENDS)
 def test_get_backend(api, backend_name):
     """Retrieves the right backend"""
     provider = _get_test_provider(url=API_URL)
-    expected_json = get_record(BACKENDS_LIST, _filter={"name": backend_name})
+    expected_json = BACKENDS_BY_NAME[backend_name]
     expected = OpenPulseBackend(
         data=TergiteBackendConfig(**expected_json), provider=provider, base_url=API_URL
     )
@@ -50,11 +44,11 @@ def test_get_malformed_backend(api):
         provider.get_backend(MALFORMED_BACKEND)
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
+@pytest.mark.parametrize("backend_name", GOOD_BACKENDS, ids=GOOD_BACKENDS)
 def test_bearer_auth(bearer_auth_api, backend_name):
     """Retrieves the data if backend is shielded with basic auth"""
     provider = _get_test_provider(url=API_URL, token=API_TOKEN)
-    expected_json = get_record(BACKENDS_LIST, _filter={"name": backend_name})
+    expected_json = BACKENDS_BY_NAME[backend_name]
     expected = OpenPulseBackend(
         data=TergiteBackendConfig(**expected_json), provider=provider, base_url=API_URL
     )
@@ -62,12 +56,11 @@ def test_bearer_auth(bearer_auth_api, backend_name):
     assert got == expected
 
 
-@pytest.mark.parametrize("token, backend", _INVALID_PARAMS)
-def test_invalid_bearer_auth(token, backend, bearer_auth_api):
+def test_invalid_bearer_auth(token, backend_name, bearer_auth_api):
     """Invalid bearer auth raises RuntimeError if backend is shielded with bearer auth"""
     provider = _get_test_provider(url=API_URL, token=token)
     with pytest.raises(RuntimeError, match="GET request for backends timed out."):
-        provider.get_backend(backend)
+        provider.get_backend(backend_name)
 
 
 def _get_test_provider(url: str, token: str = None) -> Provider:
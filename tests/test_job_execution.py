@@ -10,13 +10,12 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 """tests for the running of qiskit circuits on the tergite backend"""
-import json
-import uuid
-import warnings
-from collections import Counter
-from typing import List, Optional
+import functools
+import itertools
+from typing import Dict, Optional, Tuple
 
 import numpy as np
+import orjson
 import pytest
 from qiskit import QuantumCircuit, circuit, compiler, pulse
 from qiskit.providers import JobStatus
@@ -25,16 +24,15 @@ from qiskit.result.models import ExperimentResult, ExperimentResultData
 
 # cross compatibility with future qiskit version where deprecated packages are removed
 from tergite.qiskit.deprecated.compiler.assembler import assemble
-from tergite.qiskit.providers import Job, OpenPulseBackend, Tergite
+from tergite.qiskit.providers import Job, OpenPulseBackend, Provider, Tergite
 from tergite.qiskit.providers.backend import DeviceCalibrationV2, TergiteBackendConfig
 from tergite.qiskit.providers.provider_account import ProviderAccount
 from tergite.qiskit.providers.template_schedules import cz
 from tests.conftest import (
     API_TOKEN,
     API_URL,
-    BACKENDS_LIST,
+    BACKENDS_BY_NAME,
     GOOD_BACKENDS,
-    INVALID_API_TOKENS,
     NUMBER_OF_SHOTS,
     QUANTUM_COMPUTER_URL,
     TEST_CALIBRATIONS_MAP,
@@ -43,27 +41,60 @@ from tests.conftest import (
     TEST_QOBJ_ID,
     TWO_QUBIT_BACKENDS,
     TEST_QOBJ_RESULTS_MAP,
+    URLS,
 )
-from tests.utils.records import get_record
 from tests.utils.requests import MockRequest, get_request_list
 
-_INVALID_PARAMS = [
-    (token, backend) for backend in GOOD_BACKENDS for token in INVALID_API_TOKENS
+# The class QobjExperimentHeader used by assemble is deprecated
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning:qiskit")
+
+# tests of the same backend run on the same pytest-xdist worker, sharing its backends
+_GOOD_BACKEND_PARAMS = [
+    pytest.param(name, marks=pytest.mark.xdist_group(name), id=name)
+    for name in GOOD_BACKENDS
+]
+_TWO_QUBIT_BACKEND_PARAMS = [
+    pytest.param(name, marks=pytest.mark.xdist_group(name), id=name)
+    for name in TWO_QUBIT_BACKENDS
 ]
+# the tests only need qobj_ids that differ, not random ones
+_QOBJ_IDS = itertools.count()
+_REGISTERED_JOBS: Dict[int, Tuple[OpenPulseBackend, Job]] = {}
+_EXPECTED_SCHEDULES: Dict[Tuple[str, int], Tuple[QuantumCircuit, pulse.Schedule]] = {}
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_transpile_1q_gates(api, backend_name):
-    """compiler.transpile(qc, backend=backend) returns backend-specific QuantumCircuits for 1-qubit ops"""
-    backend = _get_backend(name=backend_name)
-    calibrations = _get_calibrations(backend_name)
+@pytest.fixture(scope="session", params=_GOOD_BACKEND_PARAMS)
+def backend(request) -> OpenPulseBackend:
+    """A backend without auth, shared by all tests of the same backend name"""
+    yield _get_shared_backend(request.param)
+
+
+@pytest.fixture(scope="session", params=_TWO_QUBIT_BACKEND_PARAMS)
+def two_qubit_backend(request) -> OpenPulseBackend:
+    """A two-qubit backend without auth, shared by all tests of the same backend name"""
+    yield _get_shared_backend(request.param)
+
+
+@pytest.fixture(scope="session", params=_GOOD_BACKEND_PARAMS)
+def bearer_auth_backend(request) -> OpenPulseBackend:
+    """A backend with bearer auth, shared by all tests of the same backend name"""
+    yield _get_shared_backend(request.param, token=API_TOKEN)
+
+
+@pytest.fixture
+def qobj_id():
+    """A qobj_id not used by any other test in this pytest process"""
+    return f"test-qobj-{next(_QOBJ_IDS):08x}"
+
+
+def test_transpile_1q_gates(api, backend):
+    """compiler.transpile(qc, target=backend.target) returns backend-specific QuantumCircuits for 1-qubit ops"""
     qc = _get_test_1q_qiskit_circuit()
 
-    # Transpile the circuit
-    got = compiler.transpile(qc, backend=backend, initial_layout=qc.qubits)
-    expected = _get_expected_1q_transpiled_circuit(
-        backend=backend, calibrations=calibrations, circuit_name=got.name
-    )
+    # Transpile the circuit; the target is passed rather than the backend because
+    # backend.target refetches the calibrations each time transpile reads it
+    got = compiler.transpile(qc, target=backend.target, initial_layout=qc.qubits)
+    expected = _get_expected_1q_transpiled_circuit(backend.name, got.name)
 
     got_qobj = backend.make_qobj(got)
     expected_qobj = backend.make_qobj(expected, qobj_id=got_qobj.qobj_id)
@@ -73,147 +104,130 @@ def test_transpile_1q_gates(api, backend_name):
     ), "Transpiled circuit does not match expected result."
 
 
-@pytest.mark.parametrize("backend_name", TWO_QUBIT_BACKENDS)
-def test_transpile_2q_gates(api, backend_name):
-    """compiler.transpile(qc, backend=backend) returns backend-specific QuantumCircuits for 2-qubit gate ops"""
-    backend = _get_backend(name=backend_name)
-    calibrations = _get_calibrations(backend_name)
+def test_transpile_2q_gates(api, two_qubit_backend):
+    """compiler.transpile(qc, target=backend.target) returns backend-specific QuantumCircuits for 2-qubit gate ops"""
     qc = _get_test_2q_qiskit_circuit()
-    expected = _get_expected_2q_transpiled_circuit(
-        backend=backend, calibrations=calibrations, circuit_name=qc.name
-    )
+    expected = _get_expected_2q_transpiled_circuit(two_qubit_backend.name, qc.name)
 
-    # Transpile the circuit
-    got = compiler.transpile(qc, backend=backend, initial_layout=qc.qubits)
+    # Transpile the circuit; the target is passed rather than the backend because
+    # backend.target refetches the calibrations each time transpile reads it
+    got = compiler.transpile(
+        qc, target=two_qubit_backend.target, initial_layout=qc.qubits
+    )
 
-    got_qobj = backend.make_qobj(got)
-    expected_qobj = backend.make_qobj(expected, qobj_id=got_qobj.qobj_id)
+    got_qobj = two_qubit_backend.make_qobj(got)
+    expected_qobj = two_qubit_backend.make_qobj(expected, qobj_id=got_qobj.qobj_id)
 
     assert (
         got_qobj == expected_qobj
     ), "Transpiled circuit does not match expected result."
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_run_1q_gates(api, backend_name):
+def test_run_1q_gates(api, backend, qobj_id):
     """backend.run returns a registered job for 1-qubit gate operations"""
-    backend = _get_backend(backend_name)
-    calibrations = _get_calibrations(backend_name)
-    backend.set_options(shots=NUMBER_OF_SHOTS)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    qobj_id = str(uuid.uuid4())
+    tc = _get_expected_1q_transpiled_circuit(backend.name)
     expected = _get_expected_job(
         backend=backend, transpiled_circuit=tc, meas_level=2, qobj_id=qobj_id
     )
+    # only the requests made by backend.run are checked
+    api.reset_mock()
 
     got = backend.run(tc, meas_level=2, qobj_id=qobj_id)
     requests_made = get_request_list(api)
-    expected_requests = _get_all_mock_requests(backend_name)[:14]
+    expected_requests = list(_get_all_mock_requests(backend.name)[6:14])
 
     assert got == expected
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", TWO_QUBIT_BACKENDS)
-def test_run_2q_gates(api, backend_name):
+def test_run_2q_gates(api, two_qubit_backend, qobj_id):
     """backend.run returns a registered job for 2-qubit gate operations"""
-    backend = _get_backend(backend_name)
-    calibrations = _get_calibrations(backend_name)
-    backend.set_options(shots=NUMBER_OF_SHOTS)
-    tc = _get_expected_2q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    qobj_id = str(uuid.uuid4())
+    tc = _get_expected_2q_transpiled_circuit(two_qubit_backend.name)
     expected = _get_expected_job(
-        backend=backend, transpiled_circuit=tc, meas_level=2, qobj_id=qobj_id
+        backend=two_qubit_backend, transpiled_circuit=tc, meas_level=2, qobj_id=qobj_id
     )
+    # only the requests made by backend.run are checked
+    api.reset_mock()
 
-    got = backend.run(tc, meas_level=2, qobj_id=qobj_id)
+    got = two_qubit_backend.run(tc, meas_level=2, qobj_id=qobj_id)
     requests_made = get_request_list(api)
-    expected_requests = _get_all_mock_requests(backend_name)[:14]
+    expected_requests = list(_get_all_mock_requests(two_qubit_backend.name)[6:14])
 
     assert got == expected
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_run_bearer_auth(bearer_auth_api, backend_name):
+def test_run_bearer_auth(bearer_auth_api, bearer_auth_backend, qobj_id):
     """backend.run returns a registered job for API behind bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    backend.set_options(shots=NUMBER_OF_SHOTS)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    qobj_id = str(uuid.uuid4())
+    tc = _get_expected_1q_transpiled_circuit(bearer_auth_backend.name)
     expected = _get_expected_job(
-        backend=backend, transpiled_circuit=tc, meas_level=2, qobj_id=qobj_id
+        backend=bearer_auth_backend,
+        transpiled_circuit=tc,
+        meas_level=2,
+        qobj_id=qobj_id,
     )
+    # only the requests made by backend.run are checked
+    bearer_auth_api.reset_mock()
 
-    got = backend.run(tc, meas_level=2, qobj_id=qobj_id)
+    got = bearer_auth_backend.run(tc, meas_level=2, qobj_id=qobj_id)
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[:14]
+    expected_requests = list(_get_all_mock_requests(bearer_auth_backend.name)[6:14])
 
     assert got == expected
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("token, backend_name", _INVALID_PARAMS)
-def test_run_invalid_bearer_auth(token, backend_name, bearer_auth_api):
+def test_run_invalid_bearer_auth(token, backend_name, bearer_auth_api, qobj_id):
     """backend.run with invalid bearer auth raises RuntimeError if backend is shielded with bearer auth"""
     backend = _get_backend(backend_name, token=token)
     backend.set_options(shots=NUMBER_OF_SHOTS)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    qobj_id = str(uuid.uuid4())
+    tc = _get_expected_1q_transpiled_circuit(backend_name)
 
     with pytest.raises(RuntimeError, match="Unable to register job at the Tergite MSS"):
         _ = backend.run(tc, meas_level=2, qobj_id=qobj_id)
 
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:7]
+    expected_requests = list(_get_all_mock_requests(backend_name)[6:7])
 
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_result(api, backend_name):
+def test_job_result(api, backend):
     """job.result() returns a successful job's results"""
-    backend = _get_backend(backend_name)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(backend)
+    # only the requests made by the job are checked
+    api.reset_mock()
 
     expected = _get_expected_job_result(backend=backend, job=job)
 
     got = job.result()
     requests_made = get_request_list(api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:16]
+    expected_requests = list(_get_all_mock_requests(backend.name)[14:16])
 
     assert got.to_dict() == expected.to_dict()
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_result_bearer_auth(bearer_auth_api, backend_name):
+def test_job_result_bearer_auth(bearer_auth_api, bearer_auth_backend):
     """job.result() returns a successful job's results for API behind bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(bearer_auth_backend)
+    # only the requests made by the job are checked
+    bearer_auth_api.reset_mock()
 
-    expected = _get_expected_job_result(backend=backend, job=job)
+    expected = _get_expected_job_result(backend=bearer_auth_backend, job=job)
     got = job.result()
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:16]
+    expected_requests = list(_get_all_mock_requests(bearer_auth_backend.name)[14:16])
 
     assert got.to_dict() == expected.to_dict()
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("token, backend_name", _INVALID_PARAMS)
 def test_job_result_invalid_bearer_auth(token, backend_name, bearer_auth_api):
     """job.result() with invalid bearer auth raises RuntimeError if backend is shielded with bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    backend, job = _get_registered_invalid_bearer_auth_job(backend_name)
+    # only the requests made after the job was registered are checked
+    bearer_auth_api.reset_mock()
 
     # change the token to the invalid one
     backend.provider.provider_account.token = token
@@ -224,50 +238,44 @@ def test_job_result_invalid_bearer_auth(token, backend_name, bearer_auth_api):
         _ = job.result()
 
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:15]
+    expected_requests = list(_get_all_mock_requests(backend_name)[14:15])
 
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_status(api, backend_name):
+def test_job_status(api, backend):
     """job.status() returns a successful job's status"""
-    backend = _get_backend(backend_name)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(backend)
+    # only the requests made by the job are checked
+    api.reset_mock()
 
     got = job.status()
     requests_made = get_request_list(api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:15]
+    expected_requests = list(_get_all_mock_requests(backend.name)[14:15])
 
     assert got == JobStatus.DONE
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_status_bearer_auth(bearer_auth_api, backend_name):
+def test_job_status_bearer_auth(bearer_auth_api, bearer_auth_backend):
     """job.status() returns a successful job's status for API behind bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(bearer_auth_backend)
+    # only the requests made by the job are checked
+    bearer_auth_api.reset_mock()
 
     got = job.status()
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:15]
+    expected_requests = list(_get_all_mock_requests(bearer_auth_backend.name)[14:15])
 
     assert got == JobStatus.DONE
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("token, backend_name", _INVALID_PARAMS)
 def test_job_status_invalid_bearer_auth(token, backend_name, bearer_auth_api):
     """job.status() with invalid bearer auth raises RuntimeError if backend is shielded with bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    backend, job = _get_registered_invalid_bearer_auth_job(backend_name)
+    # only the requests made after the job was registered are checked
+    bearer_auth_api.reset_mock()
 
     # change the token to the invalid one
     backend.provider.provider_account.token = token
@@ -278,50 +286,44 @@ def test_job_status_invalid_bearer_auth(token, backend_name, bearer_auth_api):
         _ = job.status()
 
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:15]
+    expected_requests = list(_get_all_mock_requests(backend_name)[14:15])
 
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_download_url(api, backend_name):
+def test_job_download_url(api, backend):
     """job.download_url returns a successful job's download_url"""
-    backend = _get_backend(backend_name)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(backend)
+    # only the requests made by the job are checked
+    api.reset_mock()
 
     got = job.download_url
     requests_made = get_request_list(api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:16]
+    expected_requests = list(_get_all_mock_requests(backend.name)[14:16])
 
     assert got == TEST_JOB_RESULTS["download_url"]
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_download_url_bearer_auth(bearer_auth_api, backend_name):
+def test_job_download_url_bearer_auth(bearer_auth_api, bearer_auth_backend):
     """job.download_url returns a successful job's download_url for API behind bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(bearer_auth_backend)
+    # only the requests made by the job are checked
+    bearer_auth_api.reset_mock()
 
     got = job.download_url
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:16]
+    expected_requests = list(_get_all_mock_requests(bearer_auth_backend.name)[14:16])
 
     assert got == TEST_JOB_RESULTS["download_url"]
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("token, backend_name", _INVALID_PARAMS)
 def test_job_download_url_invalid_bearer_auth(token, backend_name, bearer_auth_api):
     """job.download_url with invalid bearer auth raises RuntimeError if backend is shielded with bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    backend, job = _get_registered_invalid_bearer_auth_job(backend_name)
+    # only the requests made after the job was registered are checked
+    bearer_auth_api.reset_mock()
 
     # change the token to the invalid one
     backend.provider.provider_account.token = token
@@ -332,56 +334,50 @@ def test_job_download_url_invalid_bearer_auth(token, backend_name, bearer_auth_a
         _ = job.download_url
 
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:15]
+    expected_requests = list(_get_all_mock_requests(backend_name)[14:15])
 
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_logfile(api, backend_name, tmp_results_file):
+def test_job_logfile(api, backend, tmp_results_file):
     """job.logfile downloads a job's data to tmp"""
-    backend = _get_backend(backend_name)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(backend)
+    # only the requests made by the job are checked
+    api.reset_mock()
 
     assert job.logfile == tmp_results_file
     requests_made = get_request_list(api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:17]
+    expected_requests = list(_get_all_mock_requests(backend.name)[14:17])
 
-    with open(tmp_results_file, "rb") as file:
-        got = json.load(file)
+    got = orjson.loads(tmp_results_file.read_bytes())
 
     assert got == TEST_JOB_RESULTS
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_job_logfile_bearer_auth(bearer_auth_api, backend_name, tmp_results_file):
+def test_job_logfile_bearer_auth(
+    bearer_auth_api, bearer_auth_backend, tmp_results_file
+):
     """job.logfile downloads a successful job's results for API behind bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    job = _get_registered_job(bearer_auth_backend)
+    # only the requests made by the job are checked
+    bearer_auth_api.reset_mock()
 
     assert job.logfile == tmp_results_file
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:17]
+    expected_requests = list(_get_all_mock_requests(bearer_auth_backend.name)[14:17])
 
-    with open(tmp_results_file, "rb") as file:
-        got = json.load(file)
+    got = orjson.loads(tmp_results_file.read_bytes())
 
     assert got == TEST_JOB_RESULTS
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("token, backend_name", _INVALID_PARAMS)
 def test_job_logfile_invalid_bearer_auth(token, backend_name, bearer_auth_api):
     """job.logfile with invalid bearer auth raises RuntimeError if backend is shielded with bearer auth"""
-    backend = _get_backend(backend_name, token=API_TOKEN)
-    calibrations = _get_calibrations(backend_name)
-    tc = _get_expected_1q_transpiled_circuit(backend=backend, calibrations=calibrations)
-    job = backend.run(tc, meas_level=2)
+    backend, job = _get_registered_invalid_bearer_auth_job(backend_name)
+    # only the requests made after the job was registered are checked
+    bearer_auth_api.reset_mock()
 
     # change the token to the invalid one
     backend.provider.provider_account.token = token
@@ -392,26 +388,20 @@ def test_job_logfile_invalid_bearer_auth(token, backend_name, bearer_auth_api):
         _ = job.logfile
 
     requests_made = get_request_list(bearer_auth_api)
-    expected_requests = _get_all_mock_requests(backend_name)[6:15]
+    expected_requests = list(_get_all_mock_requests(backend_name)[14:15])
 
     assert requests_made == expected_requests
 
 
-@pytest.mark.parametrize("backend_name", GOOD_BACKENDS)
-def test_provider_job(api_with_logfile, backend_name, token: str = None):
+def test_provider_job(api_with_logfile, backend, token: str = None):
     """Test that Provider.job returns the correct Job object."""
     # create a job the usual way
-    backend = _get_backend(backend_name)
-    backend.set_options(shots=NUMBER_OF_SHOTS)
-    calibrations = _get_calibrations(backend_name)
-    qobj_id = f"{TEST_QOBJ_ID}-{backend_name}"
-    circuit_name = TEST_QOBJ_RESULTS_MAP[backend_name.lower()]["experiments"][0][
+    qobj_id = f"{TEST_QOBJ_ID}-{backend.name}"
+    circuit_name = TEST_QOBJ_RESULTS_MAP[backend.name.lower()]["experiments"][0][
         "header"
     ]["name"]
 
-    tc = _get_expected_1q_transpiled_circuit(
-        backend=backend, calibrations=calibrations, circuit_name=circuit_name
-    )
+    tc = _get_expected_1q_transpiled_circuit(backend.name, circuit_name)
     expected = backend.run(tc, meas_level=2, qobj_id=qobj_id)
 
     # overwrite some properties that are expected to change when getting job by job id
@@ -428,18 +418,23 @@ def test_provider_job(api_with_logfile, backend_name, token: str = None):
 
 def _get_expected_job_result(backend: OpenPulseBackend, job: Job) -> Result:
     """Returns the expected job result"""
-    results = [
-        ExperimentResult(
-            header=job.payload.experiments[index].header,
-            shots=job.metadata["shots"],
-            success=True,
-            data=ExperimentResultData(
-                counts=dict(Counter(result)),
-                memory=result,
-            ),
+    experiments = job.payload.experiments
+    shots = job.metadata["shots"]
+    results = []
+    for experiment, result in zip(experiments, TEST_JOB_RESULTS["result"]["memory"]):
+        # count the bit-strings in a single sorted pass in numpy
+        keys, counts = np.unique(result, return_counts=True)
+        results.append(
+            ExperimentResult(
+                header=experiment.header,
+                shots=shots,
+                success=True,
+                data=ExperimentResultData(
+                    counts=dict(zip(keys.tolist(), counts.tolist())),
+                    memory=result,
+                ),
+            )
         )
-        for index, result in enumerate(TEST_JOB_RESULTS["result"]["memory"])
-    ]
 
     return Result(
         backend_name=backend.name,
@@ -451,6 +446,55 @@ def _get_expected_job_result(backend: OpenPulseBackend, job: Job) -> Result:
     )
 
 
+def _get_registered_job(backend: OpenPulseBackend) -> Job:
+    """Retrieves a job of the expected 1-qubit circuit, registered once per backend
+
+    The tests of the job only read it, so it is shared by all of them.
+    The backend is kept in the cache alongside its job so that its id
+    is not reused by another backend. The requests made to register the job
+    are checked by the test_run_* tests.
+
+    Args:
+        backend: the shared backend on which the job is registered
+
+    Returns:
+        the job registered on the given backend, shared by all callers
+    """
+    key = id(backend)
+    try:
+        _, job = _REGISTERED_JOBS[key]
+    except KeyError:
+        tc = _get_expected_1q_transpiled_circuit(backend.name)
+        job = backend.run(tc, meas_level=2)
+        _REGISTERED_JOBS[key] = (backend, job)
+    return job
+
+
+def _get_expected_schedule(
+    backend: OpenPulseBackend, transpiled_circuit: QuantumCircuit
+) -> pulse.Schedule:
+    """Returns the schedule of the transpiled circuit on the given backend
+
+    The schedule is computed once per backend name and circuit instance.
+    The circuit is kept in the cache alongside its schedule so that its id
+    is not reused by another circuit.
+
+    Args:
+        backend: the backend on which the circuit is to be scheduled
+        transpiled_circuit: the circuit already transpiled for the backend
+
+    Returns:
+        the pulse.Schedule of the circuit, shared by all callers
+    """
+    key = (backend.name, id(transpiled_circuit))
+    try:
+        _, schedule = _EXPECTED_SCHEDULES[key]
+    except KeyError:
+        schedule = compiler.schedule(transpiled_circuit, backend=backend)
+        _EXPECTED_SCHEDULES[key] = (transpiled_circuit, schedule)
+    return schedule
+
+
 def _get_expected_job(
     backend: OpenPulseBackend,
     transpiled_circuit: QuantumCircuit,
@@ -458,19 +502,16 @@ def _get_expected_job(
     **options,
 ) -> Job:
     """Returns the expected job after being initialized"""
-    schedule = compiler.schedule(transpiled_circuit, backend=backend)
-    with warnings.catch_warnings():
-        # The class QobjExperimentHeader is deprecated
-        warnings.filterwarnings("ignore", category=DeprecationWarning, module="qiskit")
-        qobj = assemble(
-            experiments=[schedule],
-            backend=backend,
-            shots=NUMBER_OF_SHOTS,
-            qubit_lo_freq=backend.qubit_lo_freq,
-            meas_lo_freq=backend.meas_lo_freq,
-            qobj_id=qobj_id,
-            **options,
-        )
+    schedule = _get_expected_schedule(backend, transpiled_circuit)
+    qobj = assemble(
+        experiments=[schedule],
+        backend=backend,
+        shots=NUMBER_OF_SHOTS,
+        qubit_lo_freq=backend.qubit_lo_freq,
+        meas_lo_freq=backend.meas_lo_freq,
+        qobj_id=qobj_id,
+        **options,
+    )
 
     job = Job(backend=backend, job_id=TEST_JOB_ID, upload_url=QUANTUM_COMPUTER_URL)
 
@@ -500,20 +541,19 @@ def _get_test_2q_qiskit_circuit():
     return qc
 
 
+@functools.lru_cache(maxsize=None)
 def _get_expected_1q_transpiled_circuit(
-    backend: OpenPulseBackend,
-    calibrations: DeviceCalibrationV2,
-    circuit_name: Optional[str] = None,
+    backend_name: str, circuit_name: Optional[str] = None
 ) -> circuit.QuantumCircuit:
     """Returns a quantum circuit for 1-qubit gates specific to the TEST_BACKEND
 
     Args:
-        backend: the backend for which the circuit is transpiled
-        calibrations: the device parameters for the given backend
+        backend_name: the name of the backend for which the circuit is transpiled
         circuit_name: the name of the expected circuit
 
     Returns:
-        The circuit.QuantumCircuit that corresponds to the 1-qubit gate example
+        The circuit.QuantumCircuit that corresponds to the 1-qubit gate example.
+        It is cached per backend and circuit name, so it should not be mutated.
     """
     phase = np.pi / 2
     qc = circuit.QuantumCircuit(1, global_phase=phase, name=circuit_name)
@@ -523,34 +563,8 @@ def _get_expected_1q_transpiled_circuit(
     qc.measure_all()
 
     # initialize calibrations
-    qubit_0 = calibrations.qubits[0]
-
-    rz_block = pulse.ScheduleBlock(
-        name="RZ(λ, (0,))",
-        alignment_context=pulse.transforms.AlignLeft(),
-    )
-    rz_block.append(
-        pulse.ShiftPhase(round(phase, 10), pulse.DriveChannel(0), name="RZ q0")
-    )
-
-    rx_block = pulse.ScheduleBlock(
-        name="RX(θ, (0,))",
-        alignment_context=pulse.transforms.AlignLeft(),
-    )
-    rx_block.append(pulse.SetFrequency(qubit_0.frequency.value, pulse.DriveChannel(0)))
-    rx_block.append(
-        pulse.Play(
-            # amp represents the magnitude of the complex amplitude and can't be complex
-            pulse.Gaussian(
-                duration=round(qubit_0.pi_pulse_duration.value / backend.dt),
-                amp=round(phase / np.pi * qubit_0.pi_pulse_amplitude.value, 10),
-                sigma=round(qubit_0.pulse_sigma.value / backend.dt),
-                name="RX q0",
-            ),
-            pulse.DriveChannel(0),
-            name="RX q0",
-        )
-    )
+    rz_block = _get_rz_block(qubit_idx=0, phase=phase)
+    rx_block = _get_rx_block(backend_name, qubit_idx=0, phase=phase)
 
     qc._calibrations = {
         "rz": {((0,), (phase,)): rz_block},
@@ -560,21 +574,22 @@ def _get_expected_1q_transpiled_circuit(
     return qc
 
 
+@functools.lru_cache(maxsize=None)
 def _get_expected_2q_transpiled_circuit(
-    backend: OpenPulseBackend,
-    calibrations: DeviceCalibrationV2,
-    circuit_name: Optional[str] = None,
+    backend_name: str, circuit_name: Optional[str] = None
 ):
     """Returns a quantum circuit for 2-qubit gates specific to the TEST_BACKEND
 
     Args:
-        backend: the backend for which the circuit is transpiled
-        calibrations: the device parameters for the given backend
+        backend_name: the name of the backend for which the circuit is transpiled
         circuit_name: the name of the expected circuit
 
     Returns:
-        The circuit.QuantumCircuit that corresponds to the 2-qubit gate example
+        The circuit.QuantumCircuit that corresponds to the 2-qubit gate example.
+        It is cached per backend and circuit name, so it should not be mutated.
     """
+    backend = _get_backend(backend_name)
+    calibrations = _get_calibrations(backend_name)
     phase = np.pi / 2
     qc = circuit.QuantumCircuit(2, global_phase=np.pi, name=circuit_name)
     qc.rz(phase, 0)
@@ -589,100 +604,176 @@ def _get_expected_2q_transpiled_circuit(
 
     qc.measure_all()
 
-    ##
-    qubit_0 = calibrations.qubits[0]
-    qubit_1 = calibrations.qubits[1]
-
     # initialize calibrations
-    # rz_block_0
-    rz_block_0 = pulse.ScheduleBlock(
-        name="RZ(λ, (0,))",
-        alignment_context=pulse.transforms.AlignLeft(),
-    )
-    rz_block_0.append(
-        pulse.ShiftPhase(round(phase, 10), pulse.DriveChannel(0), name="RZ q0")
-    )
+    rz_block_0 = _get_rz_block(qubit_idx=0, phase=phase)
+    rz_block_1 = _get_rz_block(qubit_idx=1, phase=phase)
+    rx_block_0 = _get_rx_block(backend_name, qubit_idx=0, phase=phase)
+    rx_block_1 = _get_rx_block(backend_name, qubit_idx=1, phase=phase)
 
-    # rz_block_1
-    rz_block_1 = pulse.ScheduleBlock(
-        name="RZ(λ, (1,))",
-        alignment_context=pulse.transforms.AlignLeft(),
-    )
-    rz_block_1.append(
-        pulse.ShiftPhase(round(phase, 10), pulse.DriveChannel(1), name="RZ q1")
+    # cz_block
+    cz_block = cz(
+        backend=backend,
+        control_qubit_idxs=(0,),
+        target_qubit_idxs=(1,),
+        device_properties=calibrations,
     )
 
-    # rx_block_0
-    rx_block_0 = pulse.ScheduleBlock(
-        name="RX(θ, (0,))",
+    qc._calibrations = {
+        "cz": {((0, 1), ()): cz_block},
+        "rz": {((0,), (phase,)): rz_block_0, ((1,), (phase,)): rz_block_1},
+        "rx": {((0,), (phase,)): rx_block_0, ((1,), (phase,)): rx_block_1},
+    }
+
+    return qc
+
+
+@functools.lru_cache(maxsize=None)
+def _get_rz_block(qubit_idx: int, phase: float) -> pulse.ScheduleBlock:
+    """Returns the expected calibration of an RZ gate on the given qubit
+
+    Args:
+        qubit_idx: the index of the qubit
+        phase: the angle of the rotation
+
+    Returns:
+        the pulse.ScheduleBlock of the gate, shared by all expected circuits
+    """
+    rz_block = pulse.ScheduleBlock(
+        name=f"RZ(λ, ({qubit_idx},))",
         alignment_context=pulse.transforms.AlignLeft(),
     )
-    rx_block_0.append(
-        pulse.SetFrequency(qubit_0.frequency.value, pulse.DriveChannel(0))
-    )
-    rx_block_0.append(
-        pulse.Play(
-            # amp represents the magnitude of the complex amplitude and can't be complex
-            pulse.Gaussian(
-                duration=round(qubit_0.pi_pulse_duration.value / backend.dt),
-                amp=round(phase / np.pi * qubit_0.pi_pulse_amplitude.value, 10),
-                sigma=round(qubit_0.pulse_sigma.value / backend.dt),
-                name="RX q0",
-            ),
-            pulse.DriveChannel(0),
-            name="RX q0",
+    rz_block.append(
+        pulse.ShiftPhase(
+            round(phase, 10), pulse.DriveChannel(qubit_idx), name=f"RZ q{qubit_idx}"
         )
     )
+    return rz_block
+
+
+@functools.lru_cache(maxsize=None)
+def _get_rx_block(
+    backend_name: str, qubit_idx: int, phase: float
+) -> pulse.ScheduleBlock:
+    """Returns the expected calibration of an RX gate on the given qubit of a backend
 
-    # rx_block_1
-    rx_block_1 = pulse.ScheduleBlock(
-        name="RX(θ, (1,))",
+    Args:
+        backend_name: the name of the backend
+        qubit_idx: the index of the qubit
+        phase: the angle of the rotation
+
+    Returns:
+        the pulse.ScheduleBlock of the gate, shared by all expected circuits
+    """
+    frequency, duration, sigma, pi_pulse_amplitude = _get_rx_pulse_params(backend_name)[
+        qubit_idx
+    ]
+    rx_block = pulse.ScheduleBlock(
+        name=f"RX(θ, ({qubit_idx},))",
         alignment_context=pulse.transforms.AlignLeft(),
     )
-    rx_block_1.append(
-        pulse.SetFrequency(qubit_1.frequency.value, pulse.DriveChannel(1))
-    )
-    rx_block_1.append(
+    rx_block.append(pulse.SetFrequency(frequency, pulse.DriveChannel(qubit_idx)))
+    rx_block.append(
         pulse.Play(
             # amp represents the magnitude of the complex amplitude and can't be complex
             pulse.Gaussian(
-                duration=round(qubit_1.pi_pulse_duration.value / backend.dt),
-                amp=round(phase / np.pi * qubit_1.pi_pulse_amplitude.value, 10),
-                sigma=round(qubit_1.pulse_sigma.value / backend.dt),
-                name="RX q1",
+                duration=duration,
+                amp=round(phase / np.pi * pi_pulse_amplitude, 10),
+                sigma=sigma,
+                name=f"RX q{qubit_idx}",
             ),
-            pulse.DriveChannel(1),
-            name="RX q1",
+            pulse.DriveChannel(qubit_idx),
+            name=f"RX q{qubit_idx}",
         )
     )
+    return rx_block
 
-    # cz_block
-    cz_block = cz(
-        backend=backend,
-        control_qubit_idxs=(0,),
-        target_qubit_idxs=(1,),
-        device_properties=calibrations,
-    )
 
-    qc._calibrations = {
-        "cz": {((0, 1), ()): cz_block},
-        "rz": {((0,), (phase,)): rz_block_0, ((1,), (phase,)): rz_block_1},
-        "rx": {((0,), (phase,)): rx_block_0, ((1,), (phase,)): rx_block_1},
-    }
+@functools.lru_cache(maxsize=None)
+def _get_rx_pulse_params(backend_name: str) -> Dict[int, Tuple[float, int, int, float]]:
+    """Retrieves the parameters of the RX pulses of each qubit of the given backend
 
-    return qc
+    Args:
+        backend_name: the name of the backend
+
+    Returns:
+        a map of qubit index to a tuple of the drive frequency, the pulse duration
+        and the pulse sigma in samples, and the pi pulse amplitude of that qubit
+    """
+    dt = _get_backend(backend_name).dt
+    return {
+        index: (
+            qubit.frequency.value,
+            round(qubit.pi_pulse_duration.value / dt),
+            round(qubit.pulse_sigma.value / dt),
+            qubit.pi_pulse_amplitude.value,
+        )
+        for index, qubit in enumerate(_get_calibrations(backend_name).qubits)
+    }
 
 
 def _get_backend(name: str, token: str = None):
     """Retrieves the right backend"""
-    account = ProviderAccount(service_name="test", url=API_URL, token=token)
-    provider = Tergite.use_provider_account(account)
-    expected_json = get_record(BACKENDS_LIST, _filter={"name": name})
+    if token is None:
+        provider = _get_default_provider()
+    else:
+        account = ProviderAccount(service_name="test", url=API_URL, token=token)
+        provider = Tergite.use_provider_account(account)
+    expected_json = BACKENDS_BY_NAME[name]
     return OpenPulseBackend(
         data=TergiteBackendConfig(**expected_json), provider=provider, base_url=API_URL
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _get_registered_invalid_bearer_auth_job(
+    backend_name: str,
+) -> Tuple[OpenPulseBackend, Job]:
+    """Registers a job on a backend with bearer auth for the invalid token tests
+
+    The job is registered once per backend name with the valid token. Each
+    invalid token test then sets its own token on the provider account of the
+    backend, so this backend should not be used by any other tests.
+
+    Args:
+        backend_name: the name of the backend
+
+    Returns:
+        a tuple of the backend and the job registered on it
+    """
+    backend = _get_backend(backend_name, token=API_TOKEN)
+    tc = _get_expected_1q_transpiled_circuit(backend_name)
+    return backend, backend.run(tc, meas_level=2)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_default_provider() -> Provider:
+    """Retrieves the provider without a token, shared by all backends without auth
+
+    Only the tests with a token change the provider account of their backend,
+    so the provider without a token is never changed.
+    """
+    account = ProviderAccount(service_name="test", url=API_URL)
+    return Tergite.use_provider_account(account)
+
+
+def _get_shared_backend(name: str, token: Optional[str] = None) -> OpenPulseBackend:
+    """Retrieves a backend that is to be shared across tests
+
+    Tests that use a shared backend should not change its provider account.
+
+    Args:
+        name: the name of the backend
+        token: the API token of the provider account of the backend
+
+    Returns:
+        the backend with its shots already set to NUMBER_OF_SHOTS
+    """
+    backend = _get_backend(name, token=token)
+    backend.set_options(shots=NUMBER_OF_SHOTS)
+    return backend
+
+
+@functools.lru_cache(maxsize=None)
 def _get_calibrations(backend_name: str) -> DeviceCalibrationV2:
     """Retrieves the device calibrations for the given device
 
@@ -690,53 +781,38 @@ def _get_calibrations(backend_name: str) -> DeviceCalibrationV2:
         backend_name: the name of the device
 
     Returns:
-        the DeviceCalibrationV2 of the given device
+        the DeviceCalibrationV2 of the given device, shared by all callers
     """
     data = TEST_CALIBRATIONS_MAP[backend_name]
     return DeviceCalibrationV2(**data)
 
 
-def _get_all_mock_requests(backend_name: str) -> List[MockRequest]:
+@functools.lru_cache(maxsize=None)
+def _get_all_mock_requests(backend_name: str) -> Tuple[MockRequest, ...]:
     """Generates all the possible mock requests for a given backend
 
     Args:
         backend_name: the name of the backend
 
     Returns:
-        The list of all MockRequests for the given backend name
+        The tuple of all MockRequests for the given backend name, cached per backend
     """
-    return [
-        *[
-            MockRequest(
-                url=f"https://api.tergite.example/v2/calibrations/{backend_name}",
-                method="GET",
-            )
-            for _ in range(6)
-        ],
+    # backend.target fetches the calibrations each time it is read
+    calibrations_request = MockRequest(
+        url=f"{API_URL}/v2/calibrations/{backend_name}", method="GET"
+    )
+    job_request = MockRequest(url=URLS.test_job_results, method="GET", has_text=False)
+    return (
+        *(calibrations_request,) * 6,
         MockRequest(
-            url=f"https://api.tergite.example/jobs?backend={backend_name}",
+            url=f"{URLS.jobs}?backend={backend_name}",
             method="POST",
         ),
-        *[
-            MockRequest(
-                url=f"https://api.tergite.example/v2/calibrations/{backend_name}",
-                method="GET",
-            )
-            for _ in range(6)
-        ],
-        MockRequest(url="http://loke.tergite.example/", method="POST", has_text=True),
-        MockRequest(
-            url="https://api.tergite.example/jobs/test_job_id",
-            method="GET",
-            has_text=False,
-        ),
-        MockRequest(
-            url="https://api.tergite.example/jobs/test_job_id",
-            method="GET",
-            has_text=False,
-        ),
-        MockRequest(url="http://loke.tergite.example/test_file.hdf5", method="GET"),
-    ]
+        *(calibrations_request,) * 6,
+        MockRequest(url=f"{QUANTUM_COMPUTER_URL}/", method="POST", has_text=True),
+        *(job_request,) * 2,
+        MockRequest(url=URLS.test_results_download, method="GET"),
+    )
 
 
 # def _test_wacqt_cz_gate(duration, name, numerical_args):
@@ -7,6 +7,7 @@ from tergite.qiskit.providers import factory, provider_account
 from tests.utils.fixtures import load_json_fixture
 
 _PROVIDER_ACCOUNTS = load_json_fixture("provider_accounts.json")
+_SERVICE_REGEX = re.compile(r"\[service\s+(.+?)]\n")
 
 
 @pytest.mark.parametrize("account_data", _PROVIDER_ACCOUNTS)
@@ -62,5 +63,5 @@ def test_get_provider_non_existing(account_data, mock_tergiterc):
     with open(mock_tergiterc, "r") as file:
         conf = file.read()
 
-    first_service_name = re.search(r"\[service\s+(.+?)]\n", conf).group(1)
+    first_service_name = _SERVICE_REGEX.search(conf).group(1)
     assert provider.provider_account.service_name == first_service_name
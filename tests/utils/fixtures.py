@@ -10,17 +10,23 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
-import json
+import functools
 from os import path
 from typing import Any, Dict, List, Union
 
+import orjson
+
 _TESTS_FOLDER = path.dirname(path.dirname(path.abspath(__file__)))
 _FIXTURES_PATH = path.join(_TESTS_FOLDER, "fixtures")
 
 
+@functools.cache
 def load_json_fixture(file_name: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
     """Loads the given fixture from the fixtures directory
 
+    The parsed fixture is cached per file name so the returned object is shared
+    by all callers and should not be mutated.
+
     Args:
         file_name: the name of the file that contains the fixture
 
@@ -29,7 +35,7 @@ def load_json_fixture(file_name: str) -> Union[Dict[str, Any], List[Dict[str, An
     """
     fixture_path = _get_fixture_path(file_name)
     with open(fixture_path, "rb") as file:
-        return json.load(file)
+        return orjson.loads(file.read())
 
 
 def _get_fixture_path(*paths: str) -> str:
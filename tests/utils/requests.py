@@ -15,7 +15,7 @@ import json
 from typing import Any, Dict, List, Optional
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class MockRequest:
     url: str
     method: str